@@ -3,12 +3,118 @@
 Create .icns file from blue1.png for Markdown Pro app
 """
 
+import argparse
+import io
 import os
-import subprocess
+import pathlib
+import struct
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image
 
-def create_iconset():
-    """Create iconset from blue1.png"""
+# Icon sizes needed for macOS
+ICON_SIZES = [
+    (16, "icon_16x16.png"),
+    (32, "icon_16x16@2x.png"),
+    (32, "icon_32x32.png"),
+    (64, "icon_32x32@2x.png"),
+    (128, "icon_128x128.png"),
+    (256, "icon_128x128@2x.png"),
+    (256, "icon_256x256.png"),
+    (512, "icon_256x256@2x.png"),
+    (512, "icon_512x512.png"),
+    (1024, "icon_512x512@2x.png"),
+]
+
+# The size table is fixed, so derive the resize plan once at import:
+# filenames grouped by size (e.g. 32 backs both 16@2x and 32x32), and
+# the distinct sizes largest first for the pyramid
+ICON_ALIASES = {}
+for _size, _filename in ICON_SIZES:
+    ICON_ALIASES.setdefault(_size, []).append(_filename)
+PYRAMID_SIZES = sorted(ICON_ALIASES, reverse=True)
+
+# Largest icon size produced with an area average instead of LANCZOS
+BOX_MAX_SIZE = 32
+
+# ICNS chunk type for each iconset file, all of which hold PNG data
+ICNS_TYPES = {
+    "icon_16x16.png": b"icp4",
+    "icon_16x16@2x.png": b"ic11",
+    "icon_32x32.png": b"icp5",
+    "icon_32x32@2x.png": b"ic12",
+    "icon_128x128.png": b"ic07",
+    "icon_128x128@2x.png": b"ic13",
+    "icon_256x256.png": b"ic08",
+    "icon_256x256@2x.png": b"ic14",
+    "icon_512x512.png": b"ic09",
+    "icon_512x512@2x.png": b"ic10",
+}
+
+def _build_pyramid(img, sizes):
+    """Resize img to each of the given sizes, which must be largest first"""
+    pyramid = {}
+    # Sizes at or above the source's own come straight from the source: the
+    # matching size is the source itself, and a larger one is a single
+    # upscale, never fed back into the smaller levels
+    source_size = max(img.size)
+    for size in sizes:
+        if size < source_size:
+            break
+        if img.size == (size, size):
+            pyramid[size] = img
+        else:
+            pyramid[size] = img.resize((size, size), Image.Resampling.LANCZOS)
+    chain = [size for size in sizes if size < source_size]
+    if not chain:
+        return pyramid
+
+    # When the source is a power-of-two multiple of the largest size, a
+    # single Image.reduce() box pass brings it down to twice that size so
+    # LANCZOS only has the final 2x step left
+    factor = img.width // chain[0]
+    if (img.width == img.height and img.width % chain[0] == 0
+            and factor >= 4 and factor & (factor - 1) == 0):
+        img = img.reduce(factor // 2)
+
+    # Each smaller level is resized from the one above it instead of from
+    # the source, so the small sizes filter a 2x parent rather than the
+    # original
+    current = img
+    for size in chain:
+        # At 32px and below a plain area average is visually
+        # indistinguishable from LANCZOS and much cheaper; from a 2x parent
+        # BOX is exactly that
+        if size <= BOX_MAX_SIZE:
+            resample = Image.Resampling.BOX
+        else:
+            resample = Image.Resampling.LANCZOS
+        # reducing_gap lets Pillow do a cheap integer box reduction first
+        # when the shrink factor is large, then finish with LANCZOS on the
+        # smaller intermediate; it has no effect on the 2x steps
+        current = current.resize((size, size), resample, reducing_gap=3.0)
+        pyramid[size] = current
+    return pyramid
+
+def _save(image, filenames, out_dir):
+    """Encode one pyramid level as PNG and save it under each given filename"""
+    buf = io.BytesIO()
+    # Fast zlib setting: the encode dominates save time and the size
+    # difference is modest at icon resolutions
+    image.save(buf, "PNG", compress_level=1)
+    data = buf.getvalue()
+    if out_dir is None:
+        return image.width, filenames, data
+    # One write() per file straight from the encoded buffer
+    for filename in filenames:
+        pathlib.Path(out_dir, filename).write_bytes(data)
+    return image.width, filenames, data
+
+def create_iconset(write_iconset=True):
+    """Create iconset from blue1.png
+
+    Returns the encoded PNG bytes by iconset filename. With
+    write_iconset=False the images stay in memory only.
+    """
 
     # Load the source image
     source_image = "blue1.png"
@@ -17,70 +123,107 @@ def create_iconset():
         return False
 
     # Create iconset directory
-    iconset_dir = "MarkdownPro.iconset"
-    os.makedirs(iconset_dir, exist_ok=True)
+    iconset_dir = "MarkdownPro.iconset" if write_iconset else None
+    if iconset_dir:
+        os.makedirs(iconset_dir, exist_ok=True)
 
-    # Open source image
+    # Open source image, decoded once in RGBA as the root of the pyramid.
+    # draft() lets JPEG sources decode at a reduced scale that still covers
+    # the largest icon (shrink-on-load); other formats ignore it
     img = Image.open(source_image)
-
-    # Define icon sizes needed for macOS
-    sizes = [
-        (16, "icon_16x16.png"),
-        (32, "icon_16x16@2x.png"),
-        (32, "icon_32x32.png"),
-        (64, "icon_32x32@2x.png"),
-        (128, "icon_128x128.png"),
-        (256, "icon_128x128@2x.png"),
-        (256, "icon_256x256.png"),
-        (512, "icon_256x256@2x.png"),
-        (512, "icon_512x512.png"),
-        (1024, "icon_512x512@2x.png"),
-    ]
+    largest = PYRAMID_SIZES[0]
+    img.draft(None, (largest, largest))
+    img = img.convert("RGBA")
+    img.load()
 
     print("Creating icon sizes...")
-    for size, filename in sizes:
-        resized = img.resize((size, size), Image.Resampling.LANCZOS)
-        output_path = os.path.join(iconset_dir, filename)
-        resized.save(output_path)
-        print(f"  Created {filename} ({size}x{size})")
-
-    print(f"\nIconset created at: {iconset_dir}")
-    return True
-
-def create_icns():
-    """Convert iconset to .icns file using macOS iconutil"""
-    iconset_dir = "MarkdownPro.iconset"
+    icons = {}
+    pyramid = _build_pyramid(img, PYRAMID_SIZES)
+
+    # Encode each size once and write the same bytes to every filename
+    # that shares it. Pillow releases the GIL while encoding, so threads
+    # are enough to spread the PNG writes across cores. Jobs go in largest
+    # first so the slowest encode (1024) never starts last and sets the tail
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+        jobs = ex.map(lambda size: _save(pyramid[size], ICON_ALIASES[size], iconset_dir),
+                      PYRAMID_SIZES)
+        for size, filenames, data in jobs:
+            for filename in filenames:
+                icons[filename] = data
+                print(f"  Created {filename} ({size}x{size})")
+
+    if iconset_dir:
+        print(f"\nIconset created at: {iconset_dir}")
+    return icons
+
+def create_icns(icons):
+    """Write the PNG images straight into an .icns container"""
     icns_file = "MarkdownPro.icns"
 
-    if not os.path.exists(iconset_dir):
-        print(f"Error: {iconset_dir} not found")
-        return False
-
+    # An .icns file is a b'icns' header with the total length, followed by
+    # one (type, length, data) chunk per image; lengths include the headers
     print(f"\nConverting to .icns...")
+    chunks = []
+    for filename, data in icons.items():
+        chunks.append(struct.pack(">4sI", ICNS_TYPES[filename], len(data) + 8))
+        chunks.append(data)
+    body = b"".join(chunks)
+
     try:
-        subprocess.run([
-            "iconutil",
-            "-c", "icns",
-            iconset_dir,
-            "-o", icns_file
-        ], check=True)
+        with open(icns_file, "wb") as f:
+            f.write(struct.pack(">4sI", b"icns", len(body) + 8))
+            f.write(body)
 
         print(f"Successfully created {icns_file}")
         return True
-    except subprocess.CalledProcessError as e:
+    except OSError as e:
         print(f"Error creating .icns file: {e}")
         return False
 
+def icns_up_to_date(check_iconset=True):
+    """Check whether MarkdownPro.icns is newer than blue1.png
+
+    With check_iconset, every file in MarkdownPro.iconset must exist and
+    be newer than blue1.png as well.
+    """
+    source_image = "blue1.png"
+    icns_file = "MarkdownPro.icns"
+    iconset_dir = "MarkdownPro.iconset"
+
+    if not os.path.exists(source_image) or not os.path.exists(icns_file):
+        return False
+    source_mtime = os.stat(source_image).st_mtime_ns
+    outputs = [icns_file]
+    if check_iconset:
+        outputs += [os.path.join(iconset_dir, filename) for _, filename in ICON_SIZES]
+    try:
+        return all(os.stat(path).st_mtime_ns >= source_mtime for path in outputs)
+    except FileNotFoundError:
+        return False
+
 def main():
+    parser = argparse.ArgumentParser(description="Create MarkdownPro.icns from blue1.png")
+    parser.add_argument("--no-iconset", action="store_true",
+                        help="build the .icns in memory without writing MarkdownPro.iconset")
+    parser.add_argument("--force", action="store_true",
+                        help="rebuild even if the outputs are newer than blue1.png")
+    args = parser.parse_args()
+
     print("Markdown Pro Icon Creator")
     print("=" * 40)
 
+    # Skip the whole rebuild when the source hasn't changed
+    if not args.force and icns_up_to_date(check_iconset=not args.no_iconset):
+        print("MarkdownPro.icns is up to date (use --force to rebuild)")
+        return
+
     # Create iconset
-    if not create_iconset():
+    icons = create_iconset(write_iconset=not args.no_iconset)
+    if not icons:
         return
 
     # Create .icns
-    if not create_icns():
+    if not create_icns(icons):
         return
 
     print("\n" + "=" * 40)
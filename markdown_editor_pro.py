@@ -9,12 +9,41 @@ import os
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, colorchooser
 import json
+import time
+import hashlib
+import tempfile
 from datetime import datetime
 import re
+from bisect import bisect_right
+from itertools import accumulate
+from functools import lru_cache
+from contextlib import contextmanager
+from difflib import SequenceMatcher
+from concurrent.futures import ThreadPoolExecutor
 
 # Settings file for persistent last folder
 SETTINGS_FILE = os.path.expanduser("~/.markdown_editor_pro.json")
 
+# Saves of one tab closer together than this are coalesced
+SAVE_DEBOUNCE_MS = 500
+
+# Consecutive file errors before they are shown in a dialog
+IO_ERROR_DIALOG_THRESHOLD = 3
+
+# Large documents are inserted into the editor in pieces of this many
+# characters so the window can redraw in between
+LOAD_CHUNK_SIZE = 64 * 1024
+
+# The preview diffs changed blocks with SequenceMatcher only when neither
+# side of the changed middle is longer than this; blank-line blocks repeat
+# so often that larger diffs (tab switches, big pastes) go superlinear
+PREVIEW_DIFF_MAX_BLOCKS = 200
+
+# mkstemp creates files readable only by their owner; a newly created file
+# gets the permissions open() would have given it instead
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
 # Default settings
 DEFAULT_SETTINGS = {
     'last_folder': os.path.expanduser("~"),
@@ -39,167 +68,411 @@ DEFAULT_SETTINGS = {
     'md_blockquote_color': '#a6adc8',
     'toolbar_bg': '#3c3c3c',
     'button_bg': '#404040',
+    'preview_debounce_ms': 150,
 }
 
+# The settings each widget's look depends on; apply_settings compares these
+# to skip reconfiguring a widget the settings dialog didn't affect
+_MD_COLOR_KEYS = ('md_h1_color', 'md_h2_color', 'md_h3_color', 'md_h4_color',
+                  'md_bold_color', 'md_italic_color', 'md_code_color',
+                  'md_code_bg', 'md_link_color', 'md_list_color',
+                  'md_blockquote_color')
+_EDITOR_STYLE_KEYS = ('editor_bg', 'editor_fg', 'editor_font_family',
+                      'editor_font_size') + _MD_COLOR_KEYS
+_PREVIEW_STYLE_KEYS = ('preview_bg', 'preview_fg', 'preview_font_family',
+                       'preview_font_size') + _MD_COLOR_KEYS
+
+# Precompiled Markdown patterns, shared by the HTML converter and the
+# editor's syntax highlighter
+# Inline spans use negated classes that stop at their closer or a line
+# break, so an unclosed marker can't set off a scan to the end of the line
+# or past it. Headers, list items and blockquotes: one alternation on the
+# line marker
+_RE_BLOCK_LINE = re.compile(r'^(?:(#{1,6})|([\*\-]|\d+\.)|(>))[ \t]+(.+)$', re.MULTILINE)
+_RE_BOLD_STAR = re.compile(r'\*\*([^*\n]+)\*\*')
+_RE_BOLD_UNDERSCORE = re.compile(r'__([^_\n]+)__')
+_RE_ITALIC_STAR = re.compile(r'\*([^*\n]+)\*')
+_RE_ITALIC_UNDERSCORE = re.compile(r'_([^_\n]+)_')
+_RE_CODE = re.compile(r'`([^`\n]+)`')
+_RE_LINK = re.compile(r'\[([^\]\n]+)\]\(([^)\n]+)\)')
+_RE_IMAGE = re.compile(r'!\[([^\]\n]+)\]\(([^)\n]+)\)')
+_RE_PARA = re.compile(r'\n{2,}')
+_RE_PRE = re.compile(r'(<pre>.*?</pre>)', re.DOTALL)
+_RE_LIST_MARKER = re.compile(r'^(?:[\*\-]|\d+\.)\s+')
+
+# All inline constructs as one alternation; the delimiter classes keep
+# ** ahead of * and stop every span at a line break
+_RE_INLINE = re.compile(
+    r'(\*\*[^*\n]+?\*\*)|(__[^_\n]+?__)'
+    r'|(\*[^*\n]+?\*)|(_[^_\n]+?_)'
+    r'|(`[^`\n]+?`)'
+    r'|(\[[^\]\n]+?\]\([^)\n]+?\))'
+)
+_INLINE_TAGS = {1: 'bold', 2: 'bold', 3: 'italic', 4: 'italic', 5: 'code', 6: 'link'}
+_RE_INLINE_MARKER = re.compile(r'[\*_`\[]')
+# Characters that can open a span in the preview renderer (no underscores)
+_RE_PREVIEW_MARKER = re.compile(r'[\*`\[]')
+
+# Line-level markers, keyed by the text before a line's first space
+_LINE_TAGS = {
+    '#': 'h1', '##': 'h2', '###': 'h3', '####': 'h4', '#####': 'h5', '######': 'h6',
+    '>': 'blockquote', '*': 'list', '-': 'list',
+}
+# The preview only styles H1-H4 and blockquotes, and drops the marker
+_PREVIEW_LINE_TAGS = {
+    '#': 'h1', '##': 'h2', '###': 'h3', '####': 'h4', '>': 'blockquote',
+}
+
+# JSON last read from or written to SETTINGS_FILE, so unchanged settings
+# are never rewritten
+_settings_blob = None
+
 def load_settings():
     """Load settings from file"""
+    global _settings_blob
     settings = DEFAULT_SETTINGS.copy()
-    if os.path.exists(SETTINGS_FILE):
+    # Just try the open: a missing file is the common first-run case and
+    # doesn't need a separate exists() stat
+    try:
+        with open(SETTINGS_FILE, 'r') as f:
+            blob = f.read()
+        settings.update(json.loads(blob))
+        _settings_blob = blob
+    except:
+        pass
+    return settings
+
+def read_file(path):
+    """Read a text file; runs on a worker thread when opening files"""
+    # One binary read and one decode is cheaper than the text-mode decoder
+    # working through the file chunk by chunk. Explicit UTF-8 rather than
+    # the locale default; utf-8-sig drops a BOM left by Windows editors
+    with open(path, 'rb') as f:
+        text = f.read().decode('utf-8-sig')
+    # Text mode would have normalised line endings; do the same here so no
+    # stray \r ends up in the editor
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+def write_file(path, data, durable=True):
+    """Atomically replace path with encoded bytes
+
+    durable=False skips the fsync: the rename still keeps the file whole,
+    but the data may sit in the page cache until the OS flushes it.
+    """
+    # Work on the file a symlink points at, so the link itself survives and
+    # the real file gets the new contents
+    path = os.path.realpath(path)
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        st = None
+
+    # A rename would split a hard-linked file from its other names; write
+    # those in place instead
+    if st is not None and st.st_nlink > 1:
+        with open(path, 'wb', buffering=1 << 20) as f:
+            f.write(data)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        return
+
+    # Write a sibling temp file and rename it over the target, so a crash
+    # mid-save never leaves a truncated file behind. mkstemp picks a fresh
+    # name, so neither an existing file nor a concurrent save of the same
+    # path can be clobbered
+    directory, name = os.path.split(path)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.' + name, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb', buffering=1 << 20) as f:
+            f.write(data)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        if st is not None:
+            _copy_file_metadata(st, path, tmp)
+        else:
+            os.chmod(tmp, 0o666 & ~_UMASK)
+        os.replace(tmp, path)
+    except:
         try:
-            with open(SETTINGS_FILE, 'r') as f:
-                saved = json.load(f)
-                settings.update(saved)
-        except:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+def _copy_file_metadata(st, src, dst):
+    """Give dst the permissions, owner and extended attributes of src"""
+    os.chmod(dst, st.st_mode & 0o7777)
+    # Only root can give a file away; as anyone else the owner is already us
+    try:
+        os.chown(dst, st.st_uid, st.st_gid)
+    except (OSError, AttributeError):
+        pass
+    # Extended attributes are only exposed by os on Linux
+    if hasattr(os, 'listxattr'):
+        try:
+            for name in os.listxattr(src):
+                os.setxattr(dst, name, os.getxattr(src, name))
+        except OSError:
             pass
-    return settings
 
 def save_settings(settings):
-    """Save settings to file"""
+    """Save settings to file, skipping the write if nothing changed"""
+    global _settings_blob
     try:
-        with open(SETTINGS_FILE, 'w') as f:
-            json.dump(settings, f, indent=2)
+        blob = json.dumps(settings, indent=2)
+        if blob == _settings_blob:
+            return
+        # Settings are cheap to lose, so don't wait on the disk for them
+        write_file(SETTINGS_FILE, blob.encode('utf-8'), durable=False)
+        _settings_blob = blob
     except:
         pass
 
-def markdown_to_html(markdown_text):
-    """Convert markdown to HTML for preview"""
-    html = markdown_text
-
-    # Headers
-    html = re.sub(r'^######\s+(.+)$', r'<h6>\1</h6>', html, flags=re.MULTILINE)
-    html = re.sub(r'^#####\s+(.+)$', r'<h5>\1</h5>', html, flags=re.MULTILINE)
-    html = re.sub(r'^####\s+(.+)$', r'<h4>\1</h4>', html, flags=re.MULTILINE)
-    html = re.sub(r'^###\s+(.+)$', r'<h3>\1</h3>', html, flags=re.MULTILINE)
-    html = re.sub(r'^##\s+(.+)$', r'<h2>\1</h2>', html, flags=re.MULTILINE)
-    html = re.sub(r'^#\s+(.+)$', r'<h1>\1</h1>', html, flags=re.MULTILINE)
-
-    # Bold
-    html = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', html)
-    html = re.sub(r'__(.+?)__', r'<strong>\1</strong>', html)
-
-    # Italic
-    html = re.sub(r'\*(.+?)\*', r'<em>\1</em>', html)
-    html = re.sub(r'_(.+?)_', r'<em>\1</em>', html)
-
-    # Code inline
-    html = re.sub(r'`(.+?)`', r'<code>\1</code>', html)
-
-    # Code blocks
-    html = re.sub(r'```(.+?)```', r'<pre><code>\1</code></pre>', html, flags=re.DOTALL)
-
-    # Links
-    html = re.sub(r'\[(.+?)\]\((.+?)\)', r'<a href="\2">\1</a>', html)
-
-    # Images
-    html = re.sub(r'!\[(.+?)\]\((.+?)\)', r'<img src="\2" alt="\1" style="max-width: 100%;">', html)
+def scan_inline(text):
+    """Find bold, italic, code and link spans in one left-to-right pass
 
-    # Lists (unordered)
-    html = re.sub(r'^\*\s+(.+)$', r'<li>\1</li>', html, flags=re.MULTILINE)
-    html = re.sub(r'^\-\s+(.+)$', r'<li>\1</li>', html, flags=re.MULTILINE)
-
-    # Lists (ordered)
-    html = re.sub(r'^\d+\.\s+(.+)$', r'<li>\1</li>', html, flags=re.MULTILINE)
-
-    # Wrap consecutive <li> tags in <ul>
-    html = re.sub(r'(<li>.*?</li>(\n<li>.*?</li>)*)', r'<ul>\1</ul>', html, flags=re.DOTALL)
-
-    # Blockquotes
-    html = re.sub(r'^>\s+(.+)$', r'<blockquote>\1</blockquote>', html, flags=re.MULTILINE)
-
-    # Line breaks
-    html = html.replace('\n\n', '<br><br>')
-
-    # Wrap in basic HTML with styles
-    full_html = f"""
+    Returns (tag, start, end) tuples. Spans never overlap or cross a line
+    break, so there is no separate "is this * part of **" check.
+    """
+    # Plain finditer would try the whole alternation at every character;
+    # jumping between marker characters keeps prose-heavy text cheap
+    spans = []
+    marker = _RE_INLINE_MARKER.search(text)
+    while marker:
+        pos = marker.start()
+        match = _RE_INLINE.match(text, pos)
+        if match:
+            spans.append((_INLINE_TAGS[match.lastindex], pos, match.end()))
+            pos = match.end()
+        else:
+            pos += 1
+        marker = _RE_INLINE_MARKER.search(text, pos)
+    return spans
+
+def _block_line_html(match):
+    """Replacement for _RE_BLOCK_LINE: <hN>, <li> or <blockquote> by marker"""
+    header, item, quote, text = match.groups()
+    if header:
+        level = len(header)
+        return f'<h{level}>{text}</h{level}>'
+    if item:
+        return f'<li>{text}</li>'
+    return f'<blockquote>{text}</blockquote>'
+
+def _wrap_list_runs(html):
+    """Wrap each run of consecutive <li> lines in <ul></ul>"""
+    # One linear pass over the lines; a DOTALL regex over the whole
+    # document can backtrack badly on long lists
+    lines = html.split('\n')
+    in_run = False
+    for i, line in enumerate(lines):
+        is_item = line.startswith('<li>') and line.endswith('</li>')
+        if is_item and not in_run:
+            lines[i] = '<ul>' + line
+        elif in_run and not is_item:
+            lines[i - 1] += '</ul>'
+        in_run = is_item
+    if in_run:
+        lines[-1] += '</ul>'
+    return '\n'.join(lines)
+
+def _code_blocks(html):
+    """Wrap each ```fenced``` span in <pre><code></code></pre>"""
+    # Pair up the fences with str.find in one forward sweep; once no closer
+    # is left, no later opener can have one either
+    parts = []
+    pos = 0
+    while True:
+        start = html.find('```', pos)
+        if start == -1:
+            break
+        end = html.find('```', start + 4)
+        if end == -1:
+            break
+        parts.append(html[pos:start])
+        parts.append(f'<pre><code>{html[start + 3:end]}</code></pre>')
+        pos = end + 3
+    parts.append(html[pos:])
+    return ''.join(parts)
+
+def _paragraph_breaks(html, out):
+    """Append html to out with each run of blank lines outside <pre> blocks
+    turned into <br><br>"""
+    # split() with a capture group puts the <pre> blocks at odd indices.
+    # The pieces go straight into the caller's output list so the body is
+    # only copied once more, by the final join
+    parts = _RE_PRE.split(html)
+    for i in range(0, len(parts), 2):
+        parts[i] = _RE_PARA.sub('<br><br>', parts[i])
+    out.extend(parts)
+
+# Page shell around the converted body; built once rather than formatted
+# into a fresh f-string on every call
+_HTML_PREFIX = """
     <html>
     <head>
         <style>
-            body {{
+            body {
                 font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Helvetica, Arial, sans-serif;
                 line-height: 1.6;
                 padding: 20px;
                 background-color: #1e1e1e;
                 color: #d4d4d4;
-            }}
-            h1, h2, h3, h4, h5, h6 {{
+            }
+            h1, h2, h3, h4, h5, h6 {
                 margin-top: 24px;
                 margin-bottom: 16px;
                 font-weight: 600;
                 line-height: 1.25;
                 color: #89b4fa;
-            }}
-            h1 {{ font-size: 2em; border-bottom: 1px solid #404040; padding-bottom: 10px; }}
-            h2 {{ font-size: 1.5em; border-bottom: 1px solid #404040; padding-bottom: 8px; }}
-            h3 {{ font-size: 1.25em; }}
-            code {{
+            }
+            h1 { font-size: 2em; border-bottom: 1px solid #404040; padding-bottom: 10px; }
+            h2 { font-size: 1.5em; border-bottom: 1px solid #404040; padding-bottom: 8px; }
+            h3 { font-size: 1.25em; }
+            code {
                 background-color: #2b2b2b;
                 padding: 2px 6px;
                 border-radius: 3px;
                 font-family: 'Menlo', 'Monaco', 'Courier New', monospace;
                 font-size: 0.9em;
                 color: #f38ba8;
-            }}
-            pre {{
+            }
+            pre {
                 background-color: #2b2b2b;
                 padding: 16px;
                 border-radius: 6px;
                 overflow-x: auto;
-            }}
-            pre code {{
+            }
+            pre code {
                 background-color: transparent;
                 padding: 0;
                 color: #d4d4d4;
-            }}
-            blockquote {{
+            }
+            blockquote {
                 border-left: 4px solid #89b4fa;
                 padding-left: 16px;
                 margin-left: 0;
                 color: #a6adc8;
-            }}
-            a {{
+            }
+            a {
                 color: #89b4fa;
                 text-decoration: none;
-            }}
-            a:hover {{
+            }
+            a:hover {
                 text-decoration: underline;
-            }}
-            ul, ol {{
+            }
+            ul, ol {
                 padding-left: 2em;
-            }}
-            li {{
+            }
+            li {
                 margin: 4px 0;
-            }}
-            strong {{
+            }
+            strong {
                 color: #fab387;
-            }}
-            em {{
+            }
+            em {
                 color: #94e2d5;
-            }}
-            img {{
+            }
+            img {
                 max-width: 100%;
                 height: auto;
-            }}
+            }
         </style>
     </head>
     <body>
-        {html}
+        """
+_HTML_SUFFIX = """
     </body>
     </html>
     """
 
-    return full_html
+# Same text, same HTML: repeat calls for unchanged buffers (cursor moves,
+# switching back to an untouched tab) skip every regex pass. str caches
+# its own hash, so the lookup costs one hash of new text and nothing after
+@lru_cache(maxsize=64)
+def markdown_to_html(markdown_text):
+    """Convert markdown to HTML for preview"""
+    html = markdown_text
+
+    # Headers, list items and blockquotes in one pass over the line starts.
+    # Running it before the inline passes also keeps a list marker from
+    # being taken for the opening * of an italic span
+    html = _RE_BLOCK_LINE.sub(_block_line_html, html)
+
+    # Most documents use only a few constructs. A substring test is a C-level
+    # scan, far cheaper than a regex pass, so each pass below is skipped
+    # when the marker it needs doesn't occur at all
+
+    # Bold
+    if '**' in html:
+        html = _RE_BOLD_STAR.sub(r'<strong>\1</strong>', html)
+    if '__' in html:
+        html = _RE_BOLD_UNDERSCORE.sub(r'<strong>\1</strong>', html)
+
+    # Italic
+    if '*' in html:
+        html = _RE_ITALIC_STAR.sub(r'<em>\1</em>', html)
+    if '_' in html:
+        html = _RE_ITALIC_UNDERSCORE.sub(r'<em>\1</em>', html)
+
+    if '`' in html:
+        # Code blocks, before inline code claims their backticks
+        html = _code_blocks(html)
+
+        # Code inline
+        html = _RE_CODE.sub(r'<code>\1</code>', html)
+
+    if '](' in html:
+        # Links
+        html = _RE_LINK.sub(r'<a href="\2">\1</a>', html)
+
+        # Images
+        html = _RE_IMAGE.sub(r'<img src="\2" alt="\1" style="max-width: 100%;">', html)
+
+    # Wrap consecutive <li> tags in <ul>
+    if '<li>' in html:
+        html = _wrap_list_runs(html)
+
+    # Wrap in basic HTML with styles, writing the line breaks (code blocks
+    # left alone) into the same list so the page is assembled in one join
+    out = [_HTML_PREFIX]
+    if '\n\n' in html:
+        _paragraph_breaks(html, out)
+    else:
+        out.append(html)
+    out.append(_HTML_SUFFIX)
+    return ''.join(out)
 
 
 class MarkdownTab:
     """Individual Markdown editing tab"""
 
-    def __init__(self, parent, tab_id, settings=None, on_content_changed=None):
+    def __init__(self, parent, tab_id, settings=None, on_content_changed=None, on_modified_changed=None):
         self.parent = parent
         self.tab_id = tab_id
         self.settings = settings or DEFAULT_SETTINGS.copy()
         self.on_content_changed = on_content_changed
+        self.on_modified_changed = on_modified_changed
         self.file_path = None
-        self.modified = False
+        self.file_dir = None
+        self.file_name = None
+        # blake2b digest of the bytes last saved to file_path, and the file's
+        # (mtime_ns, size) right after that save
+        self._saved_hash = None
+        self._saved_stat = None
+        self._modified = False
+        self._hl_job = None
+        # Lines edited since the last highlight pass (first, last)
+        self._dirty_lines = None
+        self._full_highlight_pending = False
+        # Text from the last get_content(), dropped whenever the buffer changes
+        self._content_cache = None
+        # Values of _EDITOR_STYLE_KEYS the widget is currently styled with
+        self._style = tuple(self.settings[key] for key in _EDITOR_STYLE_KEYS)
 
         # Create main container
         self.container = tk.Frame(parent, bg='#2b2b2b')
@@ -246,7 +519,8 @@ class MarkdownTab:
         self.text.bind('<KeyRelease>', self.update_position)
         self.text.bind('<ButtonRelease>', self.update_position)
         self.text.bind('<<Modified>>', self.on_text_modified)
-        self.text.bind("<Command-s>", lambda e: self.on_save_request())
+        self.text.bind('<<Paste>>', self._on_paste, add='+')
+        self.text.bind("<Command-s>", self.on_save_request)
 
         # Setup syntax highlighting
         self.setup_syntax_highlighting()
@@ -270,74 +544,70 @@ class MarkdownTab:
         self.text.tag_config('list', foreground=self.settings['md_list_color'])
         self.text.tag_config('blockquote', foreground=self.settings['md_blockquote_color'])
 
-        self.text.bind('<KeyRelease>', self.highlight_syntax)
-
-    def highlight_syntax(self, event=None):
-        """Apply Markdown syntax highlighting"""
-        content = self.text.get('1.0', tk.END)
+        self.text.bind('<KeyRelease>', self._schedule_highlight)
+
+    def _schedule_highlight(self, event=None):
+        """Coalesce a burst of keystrokes into a single highlight pass"""
+        if self._hl_job:
+            self.text.after_cancel(self._hl_job)
+        self._hl_job = self.text.after(150, self.highlight_syntax)
+
+    def highlight_syntax(self, event=None, full=False):
+        """Apply Markdown syntax highlighting
+
+        Only the lines around the last edit are re-tagged unless full is
+        set or a paste is pending; every construct highlighted here fits
+        on one line, so tags elsewhere stay valid.
+        """
+        self._hl_job = None
+        if full or self._full_highlight_pending:
+            first_line = 1
+            win_start, win_end = '1.0', tk.END
+        elif self._dirty_lines is not None:
+            dirty_first, dirty_last = self._dirty_lines
+            first_line = max(1, dirty_first - 2)
+            win_start, win_end = f'{first_line}.0', f'{dirty_last + 2}.end'
+        else:
+            # Nothing changed since the last pass (e.g. an arrow key)
+            return
+        self._dirty_lines = None
+        self._full_highlight_pending = False
+        content = self.text.get(win_start, win_end)
 
-        # Remove all tags
+        # Remove tags in the window
         for tag in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'bold', 'italic', 'code', 'link', 'list', 'blockquote']:
-            self.text.tag_remove(tag, '1.0', tk.END)
-
-        # Highlight headers
-        for line_num, line in enumerate(content.split('\n'), 1):
-            if line.startswith('# '):
-                self.text.tag_add('h1', f'{line_num}.0', f'{line_num}.end')
-            elif line.startswith('## '):
-                self.text.tag_add('h2', f'{line_num}.0', f'{line_num}.end')
-            elif line.startswith('### '):
-                self.text.tag_add('h3', f'{line_num}.0', f'{line_num}.end')
-            elif line.startswith('#### '):
-                self.text.tag_add('h4', f'{line_num}.0', f'{line_num}.end')
-            elif line.startswith('##### '):
-                self.text.tag_add('h5', f'{line_num}.0', f'{line_num}.end')
-            elif line.startswith('###### '):
-                self.text.tag_add('h6', f'{line_num}.0', f'{line_num}.end')
-            elif line.startswith('> '):
-                self.text.tag_add('blockquote', f'{line_num}.0', f'{line_num}.end')
-            elif re.match(r'^[\*\-]\s+', line) or re.match(r'^\d+\.\s+', line):
-                self.text.tag_add('list', f'{line_num}.0', f'{line_num}.end')
-
-        # Highlight bold **text**
-        for match in re.finditer(r'\*\*(.+?)\*\*', content):
-            start = f"1.0+{match.start()}c"
-            end = f"1.0+{match.end()}c"
-            self.text.tag_add('bold', start, end)
-
-        # Highlight bold __text__
-        for match in re.finditer(r'__(.+?)__', content):
-            start = f"1.0+{match.start()}c"
-            end = f"1.0+{match.end()}c"
-            self.text.tag_add('bold', start, end)
-
-        # Highlight italic *text*
-        for match in re.finditer(r'\*(.+?)\*', content):
-            start = f"1.0+{match.start()}c"
-            end = f"1.0+{match.end()}c"
-            # Only if not part of **
-            if not content[max(0, match.start()-1):match.start()] == '*':
-                self.text.tag_add('italic', start, end)
-
-        # Highlight italic _text_
-        for match in re.finditer(r'_(.+?)_', content):
-            start = f"1.0+{match.start()}c"
-            end = f"1.0+{match.end()}c"
-            # Only if not part of __
-            if not content[max(0, match.start()-1):match.start()] == '_':
-                self.text.tag_add('italic', start, end)
-
-        # Highlight inline code `code`
-        for match in re.finditer(r'`(.+?)`', content):
-            start = f"1.0+{match.start()}c"
-            end = f"1.0+{match.end()}c"
-            self.text.tag_add('code', start, end)
-
-        # Highlight links [text](url)
-        for match in re.finditer(r'\[(.+?)\]\((.+?)\)', content):
-            start = f"1.0+{match.start()}c"
-            end = f"1.0+{match.end()}c"
-            self.text.tag_add('link', start, end)
+            self.text.tag_remove(tag, win_start, win_end)
+
+        lines = content.split('\n')
+
+        # Map match offsets to line.col indices here instead of handing Tk
+        # "start+Nc" indices, which it resolves by counting characters
+        line_starts = [0, *accumulate(len(line) + 1 for line in lines)]
+
+        def to_index(offset):
+            line = bisect_right(line_starts, offset) - 1
+            return f'{first_line + line}.{offset - line_starts[line]}'
+
+        # Collect ranges per tag and apply each tag with one tag_add call,
+        # rather than one Tcl round-trip per match
+        ranges = {}
+
+        # Highlight headers, blockquotes and list items
+        for line_num, line in enumerate(lines, first_line):
+            idx = line.find(' ')
+            tag = _LINE_TAGS.get(line[:idx]) if 0 < idx <= 6 else None
+            if tag is None and _RE_LIST_MARKER.match(line):
+                # Ordered items and markers followed by a tab
+                tag = 'list'
+            if tag:
+                ranges.setdefault(tag, []).extend((f'{line_num}.0', f'{line_num}.end'))
+
+        # Highlight bold, italic, inline code and links
+        for tag, start, end in scan_inline(content):
+            ranges.setdefault(tag, []).extend((to_index(start), to_index(end)))
+
+        for tag, tag_ranges in ranges.items():
+            self.text.tag_add(tag, *tag_ranges)
 
         # Trigger preview update
         if self.on_content_changed:
@@ -349,41 +619,103 @@ class MarkdownTab:
         line, col = position.split('.')
         self.position_label.config(text=f"Line {line}, Col {int(col)+1}")
 
+    def _on_paste(self, event=None):
+        """A paste can span many lines, so rehighlight everything next pass"""
+        self._full_highlight_pending = True
+
+    @property
+    def modified(self):
+        """Whether the tab has unsaved changes"""
+        return self._modified
+
+    @modified.setter
+    def modified(self, value):
+        # Report only actual flips, not every keystroke setting it again
+        if value != self._modified:
+            self._modified = value
+            if self.on_modified_changed:
+                self.on_modified_changed(self.tab_id, value)
+
+    def _mark_line_dirty(self, line):
+        """Widen the range of lines the next highlight pass re-tags"""
+        # Several edits can land between passes (typing on one line, then
+        # clicking to another within the debounce); cover all of them
+        if self._dirty_lines is None:
+            self._dirty_lines = (line, line)
+        else:
+            first, last = self._dirty_lines
+            self._dirty_lines = (min(first, line), max(last, line))
+
+    def _mark_selection_dirty(self):
+        """Mark every line of the selection for the next highlight pass"""
+        # The insert_* helpers delete the selection and insert it again
+        # untagged, possibly over many lines; raises TclError if there is
+        # no selection
+        self._mark_line_dirty(int(self.text.index(tk.SEL_FIRST).split('.')[0]))
+        self._mark_line_dirty(int(self.text.index(tk.SEL_LAST).split('.')[0]))
+
     def on_text_modified(self, event=None):
         """Called when text is modified"""
         if self.text.edit_modified():
             self.modified = True
+            self._content_cache = None
+            self._mark_line_dirty(int(self.text.index(tk.INSERT).split('.')[0]))
             if self.on_content_changed:
                 self.on_content_changed(self.tab_id)
             self.text.edit_modified(False)
 
-    def on_save_request(self):
+    def on_save_request(self, event=None):
         """Called when save is requested"""
         pass
 
-    def get_content(self):
-        """Get the markdown text content"""
-        return self.text.get("1.0", tk.END).strip()
+    def get_content(self, fresh=False):
+        """Get the markdown text content
+
+        fresh=True always reads the widget. Saves need that: <<Modified>>,
+        which drops the cache, is queued behind events such as a Cmd+S that
+        may already be waiting.
+        """
+        # Preview updates and tab switches ask for the text often; only
+        # copy the buffer out of Tk again after it has changed
+        if fresh or self._content_cache is None:
+            self._content_cache = self.text.get("1.0", tk.END).strip()
+        return self._content_cache
 
     def set_content(self, content):
         """Set the markdown text content"""
         self.text.delete("1.0", tk.END)
-        self.text.insert("1.0", content)
-        self.highlight_syntax()
+        for pos in range(0, len(content), LOAD_CHUNK_SIZE):
+            self.text.insert(tk.END, content[pos:pos + LOAD_CHUNK_SIZE])
+            self.text.update_idletasks()
+        # <<Modified>> is only delivered later, so refresh the cached text
+        # here; the widget now holds exactly this content, so the preview
+        # after a load needn't copy it back out of Tk
+        self._content_cache = content.strip()
+        # Highlight once, after the last chunk is in
+        self.highlight_syntax(full=True)
+        # Loading isn't an edit: clear Tk's flag so the <<Modified>> event
+        # queued by the inserts finds it unset and neither marks the tab
+        # dirty nor queues another highlight once it is delivered
+        self.text.edit_modified(False)
         self.modified = False
 
     def set_file_path(self, path):
         """Set the file path for this tab"""
         self.file_path = path
+        self._saved_hash = None
+        self._saved_stat = None
+        # Split once here; saves and renames reuse the parts
         if path:
-            filename = os.path.basename(path)
-            self.file_label.config(text=filename, fg='#50fa7b')
+            self.file_dir, self.file_name = os.path.split(path)
+            self.file_label.config(text=self.file_name, fg='#50fa7b')
         else:
+            self.file_dir = self.file_name = None
             self.file_label.config(text="Untitled", fg='#808080')
 
     def insert_bold(self):
         """Insert bold markdown syntax"""
         try:
+            self._mark_selection_dirty()
             selection = self.text.get(tk.SEL_FIRST, tk.SEL_LAST)
             self.text.delete(tk.SEL_FIRST, tk.SEL_LAST)
             self.text.insert(tk.INSERT, f"**{selection}**")
@@ -396,6 +728,7 @@ class MarkdownTab:
     def insert_italic(self):
         """Insert italic markdown syntax"""
         try:
+            self._mark_selection_dirty()
             selection = self.text.get(tk.SEL_FIRST, tk.SEL_LAST)
             self.text.delete(tk.SEL_FIRST, tk.SEL_LAST)
             self.text.insert(tk.INSERT, f"*{selection}*")
@@ -408,6 +741,7 @@ class MarkdownTab:
     def insert_code(self):
         """Insert code markdown syntax"""
         try:
+            self._mark_selection_dirty()
             selection = self.text.get(tk.SEL_FIRST, tk.SEL_LAST)
             self.text.delete(tk.SEL_FIRST, tk.SEL_LAST)
             self.text.insert(tk.INSERT, f"`{selection}`")
@@ -420,15 +754,27 @@ class MarkdownTab:
     def insert_link(self):
         """Insert link markdown syntax"""
         try:
+            self._mark_selection_dirty()
             selection = self.text.get(tk.SEL_FIRST, tk.SEL_LAST)
             self.text.delete(tk.SEL_FIRST, tk.SEL_LAST)
             self.text.insert(tk.INSERT, f"[{selection}](url)")
         except:
             self.text.insert(tk.INSERT, "[text](url)")
 
+    def destroy(self):
+        """Cancel pending work and destroy the tab's widgets"""
+        if self._hl_job:
+            self.text.after_cancel(self._hl_job)
+            self._hl_job = None
+        self.container.destroy()
+
     def apply_settings(self, settings):
         """Apply new settings to the editor"""
         self.settings = settings
+        style = tuple(settings[key] for key in _EDITOR_STYLE_KEYS)
+        if style == self._style:
+            return
+        self._style = style
 
         # Update text widget colors and font
         self.text.config(
@@ -437,9 +783,10 @@ class MarkdownTab:
             font=(settings['editor_font_family'], settings['editor_font_size'])
         )
 
-        # Reapply syntax highlighting with new colors
+        # Reconfigure tags with new colors. Tag ranges don't depend on the
+        # settings, and tag_config restyles the existing ones, so there is
+        # no need to highlight the document again
         self.setup_syntax_highlighting()
-        self.highlight_syntax()
 
 
 class PreviewPanel:
@@ -448,6 +795,14 @@ class PreviewPanel:
     def __init__(self, parent, settings=None):
         self.parent = parent
         self.settings = settings or DEFAULT_SETTINGS.copy()
+        self._last_hash = None
+        # Hash and first preview line of each rendered block (the start
+        # lines carry one extra entry for the line after the last block)
+        self._block_hashes = []
+        self._block_start_lines = [1]
+        self._segment_cache = {}
+        # Values of _PREVIEW_STYLE_KEYS the widget is currently styled with
+        self._style = tuple(self.settings[key] for key in _PREVIEW_STYLE_KEYS)
         self.container = tk.Frame(parent, bg='#2b2b2b')
 
         # Header
@@ -499,84 +854,168 @@ class PreviewPanel:
         self.preview.tag_config('link', foreground=self.settings['md_link_color'], underline=True)
         self.preview.tag_config('blockquote', foreground=self.settings['md_blockquote_color'], lmargin1=20, lmargin2=20)
 
-    def update_preview(self, markdown_text):
-        """Update preview with markdown content"""
-        self.preview.config(state='normal')
-        self.preview.delete('1.0', tk.END)
-
-        if not markdown_text:
-            self.preview.config(state='disabled')
+    def render(self, markdown_text):
+        """Render markdown into parallel per-block lists
+
+        Returns (content hash, block hashes, block start lines, block
+        segments); the start lines have one extra entry for the line after
+        the last block. Touches no widgets, so it can run on a worker
+        thread; the result is handed to _apply_prerendered on the Tk thread.
+        """
+        blocks = self._split_blocks(markdown_text) if markdown_text else []
+        keys = [tuple(block) for block in blocks]
+        # Unchanged blocks reuse their segments from the previous render
+        cache = self._segment_cache
+        rendered = {}
+        for key in keys:
+            if key not in rendered:
+                segments = cache.get(key)
+                rendered[key] = segments if segments is not None else self._render_block(key)
+        self._segment_cache = rendered
+        hashes = [hash(key) for key in keys]
+        # Every source line renders as exactly one preview line
+        start_lines = list(accumulate((len(key) for key in keys), initial=1))
+        return hash(markdown_text), hashes, start_lines, [rendered[key] for key in keys]
+
+    def _apply_prerendered(self, rendered):
+        """Write the output of render() into the preview widget"""
+        content_hash, hashes, start_lines, block_segments = rendered
+        # Tab switches and focus changes often re-send identical content
+        if content_hash == self._last_hash:
             return
+        self._last_hash = content_hash
+
+        # Blocks before the first changed one and after the last changed one
+        # are already rendered; trim those off cheaply, then diff the middle
+        # so separate edits (e.g. two spots changed within one debounce)
+        # each replace only their own blocks
+        old_hashes = self._block_hashes
+        old_start_lines = self._block_start_lines
+        keep = 0
+        for old_hash, new_hash in zip(old_hashes, hashes):
+            if old_hash != new_hash:
+                break
+            keep += 1
+        tail = 0
+        limit = min(len(old_hashes), len(hashes)) - keep
+        while tail < limit and old_hashes[-1 - tail] == hashes[-1 - tail]:
+            tail += 1
+        old_middle = old_hashes[keep:len(old_hashes) - tail]
+        new_middle = hashes[keep:len(hashes) - tail]
+        if len(old_middle) <= PREVIEW_DIFF_MAX_BLOCKS and len(new_middle) <= PREVIEW_DIFF_MAX_BLOCKS:
+            opcodes = SequenceMatcher(None, old_middle, new_middle, autojunk=False).get_opcodes()
+        else:
+            # Too big to diff on the Tk thread: replace the middle in one go
+            opcodes = [('replace', 0, len(old_middle), 0, len(new_middle))]
 
+        self.preview.config(state='normal')
+        # Work from the bottom up so the old line numbers above each change
+        # still hold when it is applied
+        for op, i1, i2, j1, j2 in reversed(opcodes):
+            if op == 'equal':
+                continue
+            i1, i2, j1, j2 = i1 + keep, i2 + keep, j1 + keep, j2 + keep
+            start = f'{old_start_lines[i1]}.0'
+            end = f'{old_start_lines[i2]}.0' if i2 < len(old_hashes) else tk.END
+            self.preview.delete(start, end)
+            segments = [segment for segments in block_segments[j1:j2] for segment in segments]
+            if segments:
+                self.preview.insert(start, *segments)
+        self.preview.config(state='disabled')
+        self._block_hashes = hashes
+        self._block_start_lines = start_lines
+
+    def _split_blocks(self, markdown_text):
+        """Split text into blocks of lines, each closed by a blank line"""
+        blocks = []
+        current = []
+        for line in markdown_text.split('\n'):
+            current.append(line)
+            if not line.strip():
+                blocks.append(current)
+                current = []
+        if current:
+            blocks.append(current)
+        return blocks
+
+    def _render_block(self, lines):
+        """Render one block of lines as (chars, tags) pairs"""
+        # The pairs for a whole block go to a single insert call instead of
+        # one Tcl round-trip per span
+        segments = []
         # Simple rendering - just apply basic formatting
-        lines = markdown_text.split('\n')
         for line in lines:
-            if line.startswith('# '):
-                self.preview.insert(tk.END, line[2:] + '\n', 'h1')
-            elif line.startswith('## '):
-                self.preview.insert(tk.END, line[3:] + '\n', 'h2')
-            elif line.startswith('### '):
-                self.preview.insert(tk.END, line[4:] + '\n', 'h3')
-            elif line.startswith('#### '):
-                self.preview.insert(tk.END, line[5:] + '\n', 'h4')
-            elif line.startswith('> '):
-                self.preview.insert(tk.END, line[2:] + '\n', 'blockquote')
+            idx = line.find(' ')
+            tag = _PREVIEW_LINE_TAGS.get(line[:idx]) if 0 < idx <= 4 else None
+            if tag:
+                segments.extend((line[idx+1:] + '\n', tag))
             else:
                 # Process inline formatting
-                self._render_line(line)
-                self.preview.insert(tk.END, '\n')
+                self._render_line(line, segments)
+                segments.extend(('\n', ()))
+        return segments
 
-        self.preview.config(state='disabled')
-
-    def _render_line(self, line):
-        """Render a line with inline formatting"""
+    def _render_line(self, line, segments):
+        """Render a line with inline formatting as (chars, tags) pairs"""
         if not line:
             return
 
-        # Simple approach: process the line character by character
+        # Regular characters are not emitted one at a time; plain_start marks
+        # the start of the current plain run, flushed before each styled span
+        plain_start = 0
         pos = 0
         while pos < len(line):
+            span = None
+
             # Check for bold **
-            if line[pos:pos+2] == '**':
+            if line.startswith('**', pos):
                 end = line.find('**', pos+2)
                 if end != -1:
-                    self.preview.insert(tk.END, line[pos+2:end], 'bold')
-                    pos = end + 2
-                    continue
+                    span = line[pos+2:end], 'bold', end + 2
 
             # Check for italic *
-            if line[pos] == '*' and (pos == 0 or line[pos-1] != '*'):
+            if span is None and line[pos] == '*' and (pos == 0 or line[pos-1] != '*'):
                 end = line.find('*', pos+1)
                 if end != -1 and (end == len(line)-1 or line[end+1] != '*'):
-                    self.preview.insert(tk.END, line[pos+1:end], 'italic')
-                    pos = end + 1
-                    continue
+                    span = line[pos+1:end], 'italic', end + 1
 
             # Check for code `
-            if line[pos] == '`':
+            if span is None and line[pos] == '`':
                 end = line.find('`', pos+1)
                 if end != -1:
-                    self.preview.insert(tk.END, line[pos+1:end], 'code')
-                    pos = end + 1
-                    continue
+                    span = line[pos+1:end], 'code', end + 1
 
             # Check for links [text](url)
-            if line[pos] == '[':
+            if span is None and line[pos] == '[':
                 text_end = line.find(']', pos)
                 if text_end != -1 and text_end+1 < len(line) and line[text_end+1] == '(':
                     url_end = line.find(')', text_end+2)
                     if url_end != -1:
-                        self.preview.insert(tk.END, line[pos+1:text_end], 'link')
-                        pos = url_end + 1
-                        continue
+                        span = line[pos+1:text_end], 'link', url_end + 1
 
-            # Regular character
-            self.preview.insert(tk.END, line[pos])
-            pos += 1
+            if span is None:
+                # Regular characters: jump straight to the next possible
+                # span opener instead of stepping one character at a time
+                marker = _RE_PREVIEW_MARKER.search(line, pos + 1)
+                pos = marker.start() if marker else len(line)
+                continue
+
+            if plain_start < pos:
+                segments.extend((line[plain_start:pos], ()))
+            chars, tag, pos = span
+            segments.extend((chars, tag))
+            plain_start = pos
+
+        if plain_start < len(line):
+            segments.extend((line[plain_start:], ()))
 
     def apply_settings(self, settings):
         """Apply new settings to the preview panel"""
         self.settings = settings
+        style = tuple(settings[key] for key in _PREVIEW_STYLE_KEYS)
+        if style == self._style:
+            return
+        self._style = style
 
         # Update preview widget colors and font
         self.preview.config(
@@ -762,13 +1201,47 @@ class MarkdownEditorPro:
         # Start with a default size
         self.root.geometry("1200x700")
 
-        # Maximize window
-        self.root.after(100, self.maximize_window)
+        # Maximize window as soon as the event queue drains, not after a
+        # fixed wait
+        self.root.after_idle(self.maximize_window)
 
         # Variables
         self.tabs = {}
+        # Notebook widget path of each tab's container -> tab id
+        self._container_to_id = {}
+        # Tab shown in the notebook, or None until get_current_tab asks Tk
+        self._current_tab = None
+        # Ids of tabs with unsaved changes
+        self._dirty_tabs = set()
+        # Tab titles waiting for the next idle callback, by tab id
+        self._pending_tab_text = {}
         self.tab_counter = 0
         self.preview_visible = True
+        self._preview_job = None
+        # Nesting depth of _batch(); preview requests made inside one are
+        # only noted in _preview_dirty and served once at the end
+        self._batch_depth = 0
+        self._preview_dirty = False
+        # Preview rendering runs here so large documents don't stall typing
+        self._render_pool = ThreadPoolExecutor(max_workers=1)
+        self._preview_future = None
+        # hash() of the text most recently sent to the render pool
+        self._preview_submitted = None
+        # Wall time of the last preview render, submit to display, in ms
+        self._preview_started = 0.0
+        self._last_render_ms = 0.0
+        # File reads and writes happen here, off the Tk thread
+        self._io_pool = ThreadPoolExecutor(max_workers=1)
+        self._settings_job = None
+        # tab id -> after() job of a deferred save, and time of the last save
+        self._save_pending = {}
+        self._last_save = {}
+        # Saves running on the I/O worker -> callback for when they finish
+        self._pending_writes = {}
+        # File errors in a row, reported in the status bar until the threshold
+        self._io_error_count = 0
+        # Pending after() job that clears the status bar
+        self._status_after_id = None
 
         # Load settings
         self.settings = load_settings()
@@ -778,13 +1251,13 @@ class MarkdownEditorPro:
         self.create_widgets()
 
         # Bind shortcuts
-        self.root.bind("<Command-o>", lambda e: self.open_file())
-        self.root.bind("<Command-s>", lambda e: self.save_file())
-        self.root.bind("<Command-n>", lambda e: self.create_new_tab())
-        self.root.bind("<Command-t>", lambda e: self.create_new_tab())
-        self.root.bind("<Command-b>", lambda e: self.insert_bold())
-        self.root.bind("<Command-i>", lambda e: self.insert_italic())
-        self.root.bind("<Command-k>", lambda e: self.insert_link())
+        self.root.bind("<Command-o>", self.open_file)
+        self.root.bind("<Command-s>", self.save_file)
+        self.root.bind("<Command-n>", self.create_new_tab)
+        self.root.bind("<Command-t>", self.create_new_tab)
+        self.root.bind("<Command-b>", self.insert_bold)
+        self.root.bind("<Command-i>", self.insert_italic)
+        self.root.bind("<Command-k>", self.insert_link)
 
     def maximize_window(self):
         """Maximize window to fill screen"""
@@ -805,19 +1278,19 @@ class MarkdownEditorPro:
         toolbar = tk.Frame(self.root, bg='#3c3c3c', height=40)
         toolbar.pack(fill='x', padx=0, pady=0)
 
+        # Hover colours come from one pair of class bindings shared by every
+        # toolbar button, instead of two closures bound on each button
+        self.root.bind_class('ToolbarButton', '<Enter>',
+                             lambda e: e.widget.config(bg='#505050'))
+        self.root.bind_class('ToolbarButton', '<Leave>',
+                             lambda e: e.widget.config(bg='#404040'))
+
         def create_button(parent, text, command, side='left'):
             btn = tk.Label(parent, text=text, bg='#404040', fg='white',
                           padx=12, pady=6, cursor='hand2', relief='raised', bd=1)
             btn.pack(side=side, padx=2, pady=5)
-            btn.bind("<Button-1>", lambda e: command())
-
-            def on_enter(e):
-                btn.config(bg='#505050')
-            def on_leave(e):
-                btn.config(bg='#404040')
-
-            btn.bind("<Enter>", on_enter)
-            btn.bind("<Leave>", on_leave)
+            btn.bind("<Button-1>", command)
+            btn.bindtags(('ToolbarButton',) + btn.bindtags())
             return btn
 
         # Left side buttons
@@ -876,81 +1349,199 @@ class MarkdownEditorPro:
         self.main_paned.add(left_panel, minsize=400)
         self.main_paned.add(self.preview_panel.container, minsize=300)
 
-        # Set initial sash position (35% editor, 65% preview)
-        self.root.update_idletasks()
-        total_width = self.main_paned.winfo_width()
-        self.main_paned.sash_place(0, int(total_width * 0.35), 1)
+        # Set initial sash position (35% editor, 65% preview) once the paned
+        # window has a real size, rather than forcing a layout pass here
+        self._sash_bind_id = self.main_paned.bind('<Configure>', self._place_initial_sash)
+
+        # Create first tab once the toolbar and panes are up, so the window
+        # can show before the editor widget is built
+        self.root.after_idle(self.create_new_tab)
 
-        # Create first tab
-        self.create_new_tab()
+    def _place_initial_sash(self, event):
+        """Place the sash on the first real <Configure>, then stop listening"""
+        if event.width <= 1:
+            return
+        self.main_paned.unbind('<Configure>', self._sash_bind_id)
+        self.main_paned.sash_place(0, int(event.width * 0.35), 1)
 
-    def toggle_preview(self):
+    def toggle_preview(self, event=None):
         """Toggle preview panel visibility"""
         if self.preview_visible:
             self.main_paned.forget(self.preview_panel.container)
             self.preview_toggle_btn.config(text="PREVIEW ▶")
             self.preview_visible = False
+            if self._preview_job:
+                self.root.after_cancel(self._preview_job)
+                self._preview_job = None
         else:
             self.main_paned.add(self.preview_panel.container)
             total_width = self.main_paned.winfo_width()
             self.main_paned.sash_place(0, int(total_width * 0.35), 1)
             self.preview_toggle_btn.config(text="PREVIEW ▼")
             self.preview_visible = True
+            self._preview_dirty = False
             self.update_preview()
 
-    def create_new_tab(self):
+    def create_new_tab(self, event=None):
         """Create a new editing tab"""
         self.tab_counter += 1
         tab_id = self.tab_counter
         tab_name = f"Untitled {tab_id}"
 
-        tab = MarkdownTab(self.notebook, tab_id, self.settings, on_content_changed=self.on_tab_modified)
+        tab = MarkdownTab(self.notebook, tab_id, self.settings, on_content_changed=self.on_tab_modified,
+                          on_modified_changed=self.on_tab_modified_changed)
 
         self.tabs[tab_id] = {
             'tab': tab,
             'name': tab_name
         }
+        self._container_to_id[str(tab.container)] = tab_id
 
         self.notebook.add(tab.container, text=tab_name)
         self.notebook.select(tab.container)
+        self._current_tab = tab
         tab.text.focus_set()
 
     def get_current_tab(self):
         """Get the currently active tab"""
+        # Every keystroke path asks for this; only go back to Tk after the
+        # selection may have changed
+        if self._current_tab is not None:
+            return self._current_tab
+
         current = self.notebook.select()
         if not current:
             return None
 
-        for tab_id, tab_data in self.tabs.items():
-            if str(tab_data['tab'].container) == current:
-                return tab_data['tab']
-        return None
+        tab_id = self._container_to_id.get(current)
+        if tab_id is None:
+            return None
+        self._current_tab = self.tabs[tab_id]['tab']
+        return self._current_tab
+
+    def on_tab_modified_changed(self, tab_id, modified):
+        """Keep _dirty_tabs and the * in the tab title in step with each
+        tab's modified flag"""
+        if modified:
+            self._dirty_tabs.add(tab_id)
+            # Only the first edit after a save or load gets here, so typing
+            # doesn't touch the notebook at all
+            if tab_id in self.tabs:
+                self._set_tab_text(tab_id, f"*{self.tabs[tab_id]['name']}")
+        else:
+            self._dirty_tabs.discard(tab_id)
+
+    def _set_tab_text(self, tab_id, text):
+        """Queue a tab title change; all queued changes apply at the next idle"""
+        if not self._pending_tab_text:
+            self.root.after_idle(self._flush_tab_text)
+        self._pending_tab_text[tab_id] = text
+
+    def _flush_tab_text(self):
+        """Apply the tab titles queued by _set_tab_text"""
+        pending, self._pending_tab_text = self._pending_tab_text, {}
+        for tab_id, text in pending.items():
+            # The tab may have been closed since the change was queued
+            if tab_id in self.tabs:
+                self.notebook.tab(self.tabs[tab_id]['tab'].container, text=text)
 
     def on_tab_modified(self, tab_id):
         """Called when a tab is modified"""
-        if tab_id in self.tabs:
-            tab_data = self.tabs[tab_id]
-            tab = tab_data['tab']
-            name = tab_data['name']
-            if tab.modified and not name.startswith('*'):
-                self.notebook.tab(tab.container, text=f"*{name}")
+        # Update preview once typing pauses. While the preview is hidden
+        # there is nothing to show, so just remember to render on reshow
+        if self._batch_depth or not self.preview_visible:
+            self._preview_dirty = True
+        else:
+            self._schedule_preview()
 
-        # Update preview
+    @contextmanager
+    def _batch(self):
+        """Hold back preview updates until the outermost batch exits"""
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._preview_dirty:
+                self._preview_dirty = False
+                self.update_preview()
+
+    def _schedule_preview(self):
+        """Coalesce modification bursts into a single preview update"""
+        if self._preview_job:
+            self.root.after_cancel(self._preview_job)
+        # Back off on documents that take a while to render, so a big file
+        # isn't re-rendered every time typing pauses for a moment
+        delay = max(self.settings['preview_debounce_ms'], int(2 * self._last_render_ms))
+        self._preview_job = self.root.after(delay, self._run_scheduled_preview)
+
+    def _run_scheduled_preview(self):
+        """Run the preview update queued by _schedule_preview"""
+        self._preview_job = None
+        # Never queue a second render behind one that is still running;
+        # wait another quiet period and pick up the latest text then
+        if self._preview_future and not self._preview_future.done():
+            self._schedule_preview()
+            return
         self.update_preview()
 
     def on_tab_changed(self, event=None):
         """Called when tab changes"""
+        self._current_tab = None
         self.update_preview()
 
     def update_preview(self):
         """Update preview panel"""
         if not self.preview_visible:
             return
+        if self._batch_depth:
+            self._preview_dirty = True
+            return
 
         current_tab = self.get_current_tab()
         if current_tab:
             content = current_tab.get_content()
-            self.preview_panel.update_preview(content)
+            # Tab switches, focus changes and undo back to the shown text
+            # land here with nothing new to render. The last submitted
+            # render is always the one that ends up displayed, and str
+            # caches its hash, so this check costs next to nothing
+            content_hash = hash(content)
+            if content_hash == self._preview_submitted:
+                return
+            self._preview_submitted = content_hash
+            # Only the newest render is ever shown. A superseded one that
+            # hasn't started yet is dropped; one already running finishes
+            # and is then ignored by _apply_preview
+            if self._preview_future:
+                self._preview_future.cancel()
+            future = self._render_pool.submit(self.preview_panel.render, content)
+            self._preview_future = future
+            self._preview_started = time.perf_counter()
+            self._when_done(future, self._apply_preview)
+
+    def _when_done(self, future, callback):
+        """Call callback(future) on the Tk thread once future has finished"""
+        # Poll from the event loop rather than calling into Tk from the
+        # worker thread
+        if future.done():
+            callback(future)
+        else:
+            self.root.after(10, self._when_done, future, callback)
+
+    def _apply_preview(self, future):
+        """Show a finished render unless a newer one has been requested"""
+        if future is not self._preview_future:
+            return
+        self._preview_future = None
+        try:
+            rendered = future.result()
+        except Exception:
+            # Nothing was shown for this text, so let the next update try
+            # it again instead of treating it as already rendered
+            self._preview_submitted = None
+            raise
+        self.preview_panel._apply_prerendered(rendered)
+        self._last_render_ms = (time.perf_counter() - self._preview_started) * 1000
 
     def on_tab_right_click(self, event):
         """Handle right-click on tab"""
@@ -959,11 +1550,7 @@ class MarkdownEditorPro:
             return
 
         tab_index = int(clicked_tab)
-        tab_id = None
-        for tid, tdata in self.tabs.items():
-            if self.notebook.index(tdata['tab'].container) == tab_index:
-                tab_id = tid
-                break
+        tab_id = self._container_to_id.get(self.notebook.tabs()[tab_index])
 
         if not tab_id:
             return
@@ -984,6 +1571,8 @@ class MarkdownEditorPro:
         if tab_id not in self.tabs:
             return
 
+        self._flush_pending_save(tab_id)
+        self._finish_writes()
         tab_data = self.tabs[tab_id]
         tab = tab_data['tab']
 
@@ -996,10 +1585,13 @@ class MarkdownEditorPro:
                 return
 
         self.notebook.forget(tab.container)
-        tab.container.destroy()
+        self._current_tab = None
+        del self._container_to_id[str(tab.container)]
+        self._dirty_tabs.discard(tab_id)
+        tab.destroy()
         del self.tabs[tab_id]
 
-    def open_file(self):
+    def open_file(self, event=None):
         """Open a markdown file"""
         filename = filedialog.askopenfilename(
             title="Open Markdown File",
@@ -1013,14 +1605,19 @@ class MarkdownEditorPro:
 
         if filename:
             # Save the folder for next time
-            self.last_folder = os.path.dirname(filename)
-            self.settings['last_folder'] = self.last_folder
-            save_settings(self.settings)
+            self._remember_folder(os.path.dirname(filename))
 
-            try:
-                with open(filename, 'r') as f:
-                    content = f.read()
+            # Read on a worker so a large or slow file doesn't freeze the UI
+            future = self._io_pool.submit(read_file, filename)
+            self._when_done(future, lambda done: self._finish_open(filename, done))
+
+    def _finish_open(self, filename, future):
+        """Show a file read by open_file in a tab"""
+        try:
+            content = future.result()
 
+            # One preview render for the whole load, not one per callback
+            with self._batch():
                 # Create new tab or use current empty tab
                 current_tab = self.get_current_tab()
                 if current_tab and not current_tab.get_content() and not current_tab.file_path:
@@ -1035,22 +1632,19 @@ class MarkdownEditorPro:
                 tab.modified = False
 
                 # Update tab name
-                for tab_id, tab_data in self.tabs.items():
-                    if tab_data['tab'] == tab:
-                        tab_data['name'] = os.path.basename(filename)
-                        self.notebook.tab(tab.container, text=os.path.basename(filename))
-                        break
+                self.tabs[tab.tab_id]['name'] = tab.file_name
+                self._set_tab_text(tab.tab_id, tab.file_name)
 
                 # Update preview
                 self.update_preview()
 
-                self.status_label.config(text=f"Opened: {os.path.basename(filename)}", fg='#50fa7b')
-                self.root.after(3000, lambda: self.status_label.config(text=""))
+            self.status_label.config(text=f"Opened: {tab.file_name}", fg='#50fa7b')
+            self._clear_status_after(3000)
 
-            except Exception as e:
-                messagebox.showerror("Error", f"Error opening file:\n{str(e)}")
+        except Exception as e:
+            self._report_io_error("Error opening file", e)
 
-    def save_file(self):
+    def save_file(self, event=None):
         """Save current markdown file"""
         current_tab = self.get_current_tab()
         if not current_tab:
@@ -1061,30 +1655,122 @@ class MarkdownEditorPro:
             self.save_file_as()
             return
 
+        # Saves in quick succession collapse into one deferred write, which
+        # picks up whatever the text is by then
+        tab_id = current_tab.tab_id
+        if tab_id in self._save_pending:
+            return
+        if time.monotonic() - self._last_save.get(tab_id, 0) < SAVE_DEBOUNCE_MS / 1000:
+            self._save_pending[tab_id] = self.root.after(SAVE_DEBOUNCE_MS, self._run_pending_save, tab_id)
+        else:
+            self._do_save(current_tab)
+
+    def _run_pending_save(self, tab_id):
+        """Run the deferred save queued by save_file"""
+        del self._save_pending[tab_id]
+        if tab_id in self.tabs:
+            self._do_save(self.tabs[tab_id]['tab'])
+
+    def _flush_pending_save(self, tab_id):
+        """Run a deferred save for tab_id now, if one is queued"""
+        job = self._save_pending.get(tab_id)
+        if job:
+            self.root.after_cancel(job)
+            self._run_pending_save(tab_id)
+
+    def _do_save(self, current_tab):
+        """Write a tab to its file on the I/O worker"""
+        self._last_save[current_tab.tab_id] = time.monotonic()
+        content = current_tab.get_content(fresh=True)
+        data = content.encode('utf-8')
+
+        # Saving again what was last written here (a second Cmd+S, or
+        # an edit that was undone) needs no disk write at all, as long as
+        # nothing else has touched the file since
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        if digest == current_tab._saved_hash and self._file_unchanged(current_tab):
+            self._mark_saved(current_tab, content)
+            return
+
+        # Snapshot the path and bytes here; the Tk thread carries on while
+        # the worker writes, and _on_save_done picks up the result
+        path = current_tab.file_path
+        future = self._io_pool.submit(write_file, path, data)
+        self._pending_writes[future] = (
+            lambda done: self._on_save_done(current_tab, path, content, digest, done))
+        self._when_done(future, self._run_write_callback)
+
+    def _file_unchanged(self, tab):
+        """Check the tab's file still has the stat recorded at its last save"""
         try:
-            content = current_tab.get_content()
+            st = os.stat(tab.file_path)
+        except OSError:
+            # Deleted or unreadable: write it again
+            return False
+        return (st.st_mtime_ns, st.st_size) == tab._saved_stat
+
+    def _run_write_callback(self, future):
+        """Hand a finished write to the callback registered for it, once"""
+        callback = self._pending_writes.pop(future, None)
+        if callback:
+            callback(future)
+
+    def _finish_writes(self):
+        """Wait for in-flight saves and apply their results now"""
+        for future in list(self._pending_writes):
+            future.exception()
+            self._run_write_callback(future)
+
+    def _on_save_done(self, current_tab, path, content, digest, future):
+        """Record a save finished by the I/O worker"""
+        try:
+            future.result()
+        except Exception as e:
+            self._report_io_error("Save failed", e)
+            return
+
+        self._io_error_count = 0
+        current_tab._saved_hash = digest
+        try:
+            st = os.stat(path)
+            current_tab._saved_stat = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            current_tab._saved_stat = None
+        self._mark_saved(current_tab, content)
+
+    def _report_io_error(self, message, error):
+        """Show a file error in the status bar, escalating if errors repeat"""
+        # A one-off failure (e.g. a network share hiccup) shouldn't block
+        # the editor behind a modal; a run of them gets a real dialog
+        self._io_error_count += 1
+        if self._io_error_count >= IO_ERROR_DIALOG_THRESHOLD:
+            self._io_error_count = 0
+            messagebox.showerror("Error", f"{message}:\n{error}")
+            return
+        self.status_label.config(text=f"{message}: {error}", fg='#ff5555')
+        self._clear_status_after(4000)
 
-            with open(current_tab.file_path, 'w') as f:
-                f.write(content)
+    def _mark_saved(self, current_tab, content):
+        """Update the tab and status bar after content was saved"""
+        if current_tab.tab_id not in self.tabs:
+            return
 
-            # Save the folder for next time
-            self.last_folder = os.path.dirname(current_tab.file_path)
-            self.settings['last_folder'] = self.last_folder
-            save_settings(self.settings)
+        # Save the folder for next time
+        self._remember_folder(current_tab.file_dir)
 
+        # Typing that happened while the write was running is still unsaved
+        if current_tab.get_content(fresh=True) == content:
             current_tab.modified = False
 
-            # Update tab name (remove *)
-            for tab_id, tab_data in self.tabs.items():
-                if tab_data['tab'] == current_tab:
-                    self.notebook.tab(current_tab.container, text=tab_data['name'])
-                    break
+        # Update tab name, which Save As may have changed; keep the * if the
+        # tab is still modified
+        name = self.tabs[current_tab.tab_id]['name']
+        if current_tab.modified:
+            name = f"*{name}"
+        self._set_tab_text(current_tab.tab_id, name)
 
-            self.status_label.config(text="Saved", fg='#50fa7b')
-            self.root.after(2000, lambda: self.status_label.config(text=""))
-
-        except Exception as e:
-            messagebox.showerror("Save Error", str(e))
+        self.status_label.config(text="Saved", fg='#50fa7b')
+        self._clear_status_after(2000)
 
     def save_file_as(self):
         """Save as new file"""
@@ -1102,70 +1788,145 @@ class MarkdownEditorPro:
             current_tab.set_file_path(filename)
 
             # Update tab name
-            for tab_id, tab_data in self.tabs.items():
-                if tab_data['tab'] == current_tab:
-                    tab_data['name'] = os.path.basename(filename)
-                    break
+            self.tabs[current_tab.tab_id]['name'] = current_tab.file_name
 
-            self.save_file()
+            # The save below writes the current text anyway, so a deferred
+            # save is dropped rather than run (which would encode and write
+            # the same content a second time)
+            job = self._save_pending.pop(current_tab.tab_id, None)
+            if job:
+                self.root.after_cancel(job)
+            self._do_save(current_tab)
 
-    def insert_bold(self):
+    def insert_bold(self, event=None):
         """Insert bold markdown"""
         current_tab = self.get_current_tab()
         if current_tab:
             current_tab.insert_bold()
 
-    def insert_italic(self):
+    def insert_italic(self, event=None):
         """Insert italic markdown"""
         current_tab = self.get_current_tab()
         if current_tab:
             current_tab.insert_italic()
 
-    def insert_code(self):
+    def insert_code(self, event=None):
         """Insert code markdown"""
         current_tab = self.get_current_tab()
         if current_tab:
             current_tab.insert_code()
 
-    def insert_link(self):
+    def insert_link(self, event=None):
         """Insert link markdown"""
         current_tab = self.get_current_tab()
         if current_tab:
             current_tab.insert_link()
 
-    def open_settings(self):
+    def open_settings(self, event=None):
         """Open settings dialog"""
         SettingsDialog(self.root, self.settings, self.apply_settings)
 
     def apply_settings(self, new_settings):
         """Apply new settings"""
         self.settings = new_settings
-        save_settings(self.settings)
+        self._mark_settings_dirty()
 
-        # Apply to all existing tabs
-        for tab_id, tab_data in self.tabs.items():
-            tab = tab_data['tab']
-            tab.apply_settings(self.settings)
+        with self._batch():
+            # Apply to all existing tabs
+            for tab_data in self.tabs.values():
+                tab_data['tab'].apply_settings(self.settings)
 
-        # Apply to preview panel
-        self.preview_panel.apply_settings(self.settings)
+            # Apply to preview panel
+            self.preview_panel.apply_settings(self.settings)
 
         # Update status
         self.status_label.config(text="Settings applied", fg='#50fa7b')
-        self.root.after(2000, lambda: self.status_label.config(text=""))
+        self._clear_status_after(2000)
+
+    def _remember_folder(self, folder):
+        """Record folder as last_folder, queueing a settings write if it changed"""
+        # Repeated saves in one folder leave the settings untouched
+        if folder == self.last_folder:
+            return
+        self.last_folder = folder
+        self.settings['last_folder'] = folder
+        self._mark_settings_dirty()
+
+    def _clear_status_after(self, ms):
+        """Clear the status bar in ms milliseconds, replacing any earlier timer"""
+        # Otherwise an older message's timer would wipe a newer message early
+        if self._status_after_id:
+            self.root.after_cancel(self._status_after_id)
+        self._status_after_id = self.root.after(ms, self._clear_status)
+
+    def _clear_status(self):
+        """Clear the status bar"""
+        self._status_after_id = None
+        self.status_label.config(text="")
+
+    def _mark_settings_dirty(self):
+        """Schedule a settings write, coalescing changes made within a second"""
+        if self._settings_job is None:
+            self._settings_job = self.root.after(1000, self._flush_settings)
+
+    def _flush_settings(self):
+        """Write pending settings changes to disk"""
+        if self._settings_job is not None:
+            self.root.after_cancel(self._settings_job)
+            self._settings_job = None
+            save_settings(self.settings)
 
     def run(self):
         """Start the application"""
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
         self.root.mainloop()
 
+    def _save_all_modified(self):
+        """Save every modified tab; returns False if closing should stop"""
+        # Keyed by the real path, so two tabs on one file (or on two links to
+        # it) don't race each other's writes; the later tab wins
+        jobs = {}
+        for tab_id in sorted(self._dirty_tabs):
+            tab_data = self.tabs[tab_id]
+            tab = tab_data['tab']
+            path = tab.file_path
+            if not path:
+                self.notebook.select(tab.container)
+                self._current_tab = tab
+                path = filedialog.asksaveasfilename(
+                    title=f"Save {tab_data['name']}",
+                    defaultextension=".md",
+                    initialdir=self.last_folder,
+                    filetypes=[("Markdown files", "*.md"), ("Text files", "*.txt"), ("All files", "*.*")]
+                )
+                if not path:
+                    return False
+            jobs[os.path.realpath(path)] = tab.get_content(fresh=True).encode('utf-8')
+
+        if not jobs:
+            return True
+
+        # The files are independent, so write them concurrently and wait
+        # once rather than paying each file's latency in turn
+        with ThreadPoolExecutor(max_workers=min(16, len(jobs))) as ex:
+            futures = {path: ex.submit(write_file, path, data) for path, data in jobs.items()}
+        errors = [f"{path}: {future.exception()}"
+                  for path, future in futures.items() if future.exception()]
+        if errors:
+            messagebox.showerror("Save Error", "\n".join(errors))
+            return False
+        return True
+
     def on_closing(self):
         """Handle window closing"""
+        # Finish saves that were deferred by the debounce or are still
+        # being written
+        for tab_id in list(self._save_pending):
+            self._flush_pending_save(tab_id)
+        self._finish_writes()
+
         # Check for unsaved changes
-        unsaved = []
-        for tab_id, tab_data in self.tabs.items():
-            if tab_data['tab'].modified:
-                unsaved.append(tab_data['name'])
+        unsaved = [self.tabs[tab_id]['name'] for tab_id in sorted(self._dirty_tabs)]
 
         if unsaved:
             response = messagebox.askyesnocancel(
@@ -1175,11 +1936,12 @@ class MarkdownEditorPro:
             if response is None:  # Cancel
                 return
             elif response:  # Yes - save all
-                for tab_id, tab_data in self.tabs.items():
-                    if tab_data['tab'].modified:
-                        # Would need to implement save all
-                        pass
+                if not self._save_all_modified():
+                    return
 
+        self._flush_settings()
+        self._render_pool.shutdown(wait=False)
+        self._io_pool.shutdown(wait=False)
         self.root.destroy()
 
 